@@ -4,6 +4,8 @@ import subprocess
 import os
 import sys
 
+from spell_grammar_check import check_grammar_and_spell, parse_corrections
+
 app = Flask(__name__, static_url_path='', static_folder='static')
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -77,37 +79,16 @@ def check_grammar():
         return jsonify({'error': 'LaTeX file not found'}), 404
 
     try:
-        result = subprocess.run(
-            [
-                PYTHON_EXECUTABLE,
-                os.path.join(BASE_DIR, 'spell_grammar_check.py'),
-                latex_filepath,
-            ],
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=BASE_DIR,
-        )
-        
-        # Process the output to create a structured list of errors
-        errors = []
-        # This is a placeholder for the actual parsing of the output
-        # You will need to adjust this based on the actual output of your spell_grammar_check.py script
-        output_lines = result.stdout.strip().split('\n') if result.stdout.strip() else []
-        for line in output_lines:
-            parts = line.split(':')
-            if len(parts) >= 3:
-                errors.append({
-                    'line': parts[0],
-                    'mistake': parts[1],
-                    'suggestion': ':'.join(parts[2:])
-                })
+        # Run in-process so concurrent checks share one rate-limit scheduler.
+        with open(latex_filepath, 'r', encoding='utf-8') as f:
+            output = check_grammar_and_spell(f.read())
+        # check_grammar_and_spell reports failures (including exhausted retries) as "Error..." strings.
+        if output.startswith('Error'):
+            print(f"Error checking grammar: {output}")
+            return jsonify({'error': output}), 502
+
+        errors = parse_corrections(output)
         return jsonify({'errors': errors})
-    except subprocess.CalledProcessError as e:
-        print(f"Error checking grammar: {e}")
-        print(f"stdout: {e.stdout}")
-        print(f"stderr: {e.stderr}")
-        return jsonify({'error': f'Error checking grammar: {e.stderr}'}), 500
     except Exception as e:
         print(f"Unexpected error during grammar check: {e}")
         return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
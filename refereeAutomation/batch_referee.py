@@ -0,0 +1,286 @@
+"""
+Headless batch mode: convert and grammar-check a whole folder of submissions.
+
+Usage:
+    python batch_referee.py submissions/
+    python batch_referee.py "issue-12/*.pdf" --output-dir reports/issue-12
+"""
+import argparse
+import glob
+import hashlib
+import html
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+
+from pdf_to_latex import pdf_to_latex
+from spell_grammar_check import check_grammar_and_spell, parse_corrections
+
+STATE_FILENAME = 'batch_state.json'
+
+
+def find_pdfs(sources):
+    """Expand directories and glob patterns into a sorted list of PDF paths."""
+    pdfs = set()
+    for source in sources:
+        if os.path.isdir(source):
+            matches = glob.glob(os.path.join(source, '**', '*.pdf'), recursive=True)
+        else:
+            matches = glob.glob(source, recursive=True)
+        pdfs.update(os.path.abspath(m) for m in matches if m.lower().endswith('.pdf'))
+    return sorted(pdfs)
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def latex_names(pdf_paths, state):
+    """
+    Map each PDF to a unique .tex filename, suffixing clashing stems.
+
+    Every name recorded in `state` stays reserved, even for PDFs outside this
+    run, so two PDFs with the same stem never share a .tex across runs. PDFs
+    from an earlier run keep their recorded name.
+    """
+    names = {}
+    used = {os.path.basename(entry['latex']) for entry in state.values() if entry.get('latex')}
+    for pdf_path in pdf_paths:
+        previous = state.get(pdf_path)
+        if previous and previous.get('latex'):
+            names[pdf_path] = os.path.basename(previous['latex'])
+    for pdf_path in pdf_paths:
+        if pdf_path in names:
+            continue
+        stem = os.path.splitext(os.path.basename(pdf_path))[0]
+        name = f"{stem}.tex"
+        n = 2
+        while name in used:
+            name = f"{stem}-{n}.tex"
+            n += 1
+        used.add(name)
+        names[pdf_path] = name
+    return names
+
+
+def is_unchanged(previous, digest, page_markers):
+    """True if `previous` is a successful result for this PDF content and options
+    whose .tex is still the file that run produced."""
+    if not previous or previous.get('status') != 'ok':
+        return False
+    if previous.get('sha256') != digest or previous.get('page_markers', False) != page_markers:
+        return False
+    try:
+        return file_digest(previous['latex']) == previous.get('latex_sha256')
+    except (KeyError, OSError):
+        return False
+
+
+def load_state(output_dir):
+    path = os.path.join(output_dir, STATE_FILENAME)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable state file {path}: {e}", file=sys.stderr)
+        return {}
+
+
+def save_state(output_dir, state):
+    path = os.path.join(output_dir, STATE_FILENAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class Progress:
+    """Thread-safe one-line progress counter on stderr."""
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.lock = threading.Lock()
+
+    def advance(self, pdf_path, status):
+        with self.lock:
+            self.done += 1
+            print(f"[{self.done}/{self.total}] {status}: {os.path.basename(pdf_path)}", file=sys.stderr)
+
+
+def convert(pdf_path, latex_path, page_markers=False):
+    pdf_to_latex(pdf_path, latex_path, page_markers=page_markers)
+    return latex_path
+
+
+def check(latex_path):
+    with open(latex_path, 'r', encoding='utf-8') as f:
+        output = check_grammar_and_spell(f.read())
+    # check_grammar_and_spell reports failures as strings starting with "Error".
+    if output.startswith('Error'):
+        raise RuntimeError(output)
+    return parse_corrections(output)
+
+
+def run_batch(pdf_paths, output_dir, convert_workers, check_workers, force=False, page_markers=False):
+    """
+    Convert and check every PDF, reusing results for files whose content and
+    conversion options are unchanged.
+
+    Conversion and checking run in separate pools, so each stage has its own
+    bound on parallelism. A file moves to the check pool as soon as its
+    conversion finishes.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Loaded even with --force: its entries reserve .tex names for other PDFs.
+    state = load_state(output_dir)
+    names = latex_names(pdf_paths, state)
+    progress = Progress(len(pdf_paths))
+    results = {}
+    lock = threading.Lock()
+
+    def record(pdf_path, entry):
+        with lock:
+            results[pdf_path] = entry
+            # Failed entries are kept too, so the PDF keeps its reserved .tex name.
+            state[pdf_path] = entry
+        progress.advance(pdf_path, entry['status'])
+
+    with ThreadPoolExecutor(max_workers=convert_workers) as convert_pool, \
+            ThreadPoolExecutor(max_workers=check_workers) as check_pool:
+
+        def check_stage(pdf_path, entry):
+            try:
+                entry['errors'] = check(entry['latex'])
+                entry['status'] = 'ok'
+            except Exception as e:
+                entry['status'] = 'check_failed'
+                entry['message'] = str(e)
+            record(pdf_path, entry)
+
+        def convert_stage(pdf_path, entry):
+            """Convert, then hand the file to the check pool; returns the check future."""
+            try:
+                convert(pdf_path, entry['latex'], page_markers)
+                entry['latex_sha256'] = file_digest(entry['latex'])
+            except Exception as e:
+                entry['status'] = 'conversion_failed'
+                entry['message'] = str(e)
+                record(pdf_path, entry)
+                return None
+            return check_pool.submit(check_stage, pdf_path, entry)
+
+        convert_futures = []
+        for pdf_path in pdf_paths:
+            latex_path = os.path.join(output_dir, names[pdf_path])
+            try:
+                digest = file_digest(pdf_path)
+            except OSError as e:
+                record(pdf_path, {'pdf': pdf_path, 'latex': latex_path, 'status': 'read_failed', 'message': str(e)})
+                continue
+            previous = state.get(pdf_path)
+            if not force and is_unchanged(previous, digest, page_markers):
+                with lock:
+                    results[pdf_path] = dict(previous, skipped=True)
+                progress.advance(pdf_path, 'unchanged')
+                continue
+            entry = {
+                'pdf': pdf_path,
+                'latex': latex_path,
+                'sha256': digest,
+                'page_markers': page_markers,
+                'checked_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            }
+            convert_futures.append(convert_pool.submit(convert_stage, pdf_path, entry))
+
+        check_futures = [f.result() for f in convert_futures]
+        wait([f for f in check_futures if f is not None])
+
+    save_state(output_dir, state)
+    return [results[p] for p in pdf_paths if p in results]
+
+
+def write_json_report(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'files': results}, f, indent=2, ensure_ascii=False)
+
+
+def write_html_report(results, path):
+    rows = []
+    for entry in results:
+        name = html.escape(os.path.basename(entry['pdf']))
+        status = html.escape(entry['status'] + (' (unchanged)' if entry.get('skipped') else ''))
+        if entry['status'] != 'ok':
+            detail = f"<pre>{html.escape(entry.get('message', ''))}</pre>"
+        elif not entry.get('errors'):
+            detail = '<p>No errors found.</p>'
+        else:
+            items = ''.join(
+                f"<li><strong>Line {html.escape(e['line'])}:</strong> "
+                f"{html.escape(e['mistake'])} &rarr; {html.escape(e['suggestion'])}</li>"
+                for e in entry['errors']
+            )
+            detail = f"<ul>{items}</ul>"
+        rows.append(f"<tr><td>{name}</td><td>{status}</td><td>{detail}</td></tr>")
+
+    content = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Referee batch report</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ border: 1px solid #ccc; padding: 0.5em; vertical-align: top; text-align: left; }}
+</style>
+</head>
+<body>
+<h1>Referee batch report</h1>
+<table>
+<tr><th>File</th><th>Status</th><th>Findings</th></tr>
+{''.join(rows)}
+</table>
+</body>
+</html>
+"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert and grammar-check a folder of PDF submissions.")
+    parser.add_argument("sources", nargs='+', help="Directories or glob patterns of PDF files.")
+    parser.add_argument("--output-dir", default="batch_output", help="Where .tex files and reports go (default: batch_output).")
+    parser.add_argument("--convert-workers", type=int, default=4, help="Parallel PDF conversions (default: 4).")
+    parser.add_argument("--check-workers", type=int, default=2, help="Parallel grammar checks (default: 2).")
+    parser.add_argument("--page-markers", action="store_true", help="Emit a '%% page N' comment before each page in the .tex files.")
+    parser.add_argument("--force", action="store_true", help="Reprocess every file, even if unchanged since the last run.")
+    args = parser.parse_args()
+
+    pdf_paths = find_pdfs(args.sources)
+    if not pdf_paths:
+        print("No PDF files found.", file=sys.stderr)
+        sys.exit(1)
+
+    results = run_batch(pdf_paths, args.output_dir, args.convert_workers, args.check_workers, args.force, args.page_markers)
+
+    json_path = os.path.join(args.output_dir, 'report.json')
+    html_path = os.path.join(args.output_dir, 'report.html')
+    write_json_report(results, json_path)
+    write_html_report(results, html_path)
+    failed = sum(1 for r in results if r['status'] != 'ok')
+    print(f"Processed {len(results)} files ({failed} failed). Reports: {json_path}, {html_path}")
+    if failed:
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
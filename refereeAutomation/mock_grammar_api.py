@@ -0,0 +1,127 @@
+"""
+Local stand-in for the grammar API that simulates rate limits.
+
+Answers chat-completion POSTs with a fixed correction. It returns 429 with
+Retry-After once more than --rpm requests arrive within --window seconds, and
+can inject random 5xx errors.
+
+Usage:
+    python mock_grammar_api.py --port 8001 --rpm 5 --window 10
+    GRAMMAR_API_URL=http://127.0.0.1:8001/ GROQ_API_KEY=test python spell_grammar_check.py paper.tex
+
+    # Or run a self-contained check of the scheduler against the mock:
+    python mock_grammar_api.py --demo 12 --rpm 4 --window 2
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MOCK_CORRECTION = "1:teh:the"
+
+
+class MockState:
+    def __init__(self, rpm, window, error_rate):
+        self.rpm = rpm
+        self.window = window
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.accepted = deque()
+        self.stats = {'ok': 0, 'rate_limited': 0, 'server_error': 0}
+
+    def admit(self):
+        """Return the status code to answer with."""
+        with self.lock:
+            now = time.monotonic()
+            while self.accepted and now - self.accepted[0] >= self.window:
+                self.accepted.popleft()
+            if len(self.accepted) >= self.rpm:
+                self.stats['rate_limited'] += 1
+                return 429
+            if random.random() < self.error_rate:
+                self.stats['server_error'] += 1
+                return 503
+            self.accepted.append(now)
+            self.stats['ok'] += 1
+            return 200
+
+    def retry_after(self):
+        with self.lock:
+            if not self.accepted:
+                return 0.0
+            return max(self.accepted[0] + self.window - time.monotonic(), 0.0)
+
+
+def make_server(host, port, state):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            self.rfile.read(length)
+            status = state.admit()
+            if status == 200:
+                body = json.dumps({"choices": [{"message": {"content": MOCK_CORRECTION}}]}).encode()
+            else:
+                body = b'{"error": "simulated failure"}'
+            self.send_response(status)
+            if status == 429:
+                self.send_header('Retry-After', f"{state.retry_after():.2f}")
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def run_demo(server, state, calls):
+    """Send `calls` concurrent checks through the shared scheduler and report what happened."""
+    import os
+    os.environ.setdefault('GROQ_API_KEY', 'test')
+    import spell_grammar_check
+
+    url = f"http://127.0.0.1:{server.server_port}/"
+    spell_grammar_check.configure(api_url=url, requests_per_minute=state.rpm, window=state.window, backoff_max=state.window)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=calls) as pool:
+        results = list(pool.map(spell_grammar_check.check_grammar_and_spell, ['teh text'] * calls))
+    elapsed = time.monotonic() - started
+    succeeded = sum(1 for r in results if r == MOCK_CORRECTION)
+    print(f"{succeeded}/{calls} checks succeeded in {elapsed:.1f}s; server saw {state.stats}")
+    return succeeded == calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock grammar API that simulates rate limits.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001, help="Port to listen on (default: 8001, 0 picks a free port).")
+    parser.add_argument("--rpm", type=int, default=5, help="Requests accepted per window before answering 429 (default: 5).")
+    parser.add_argument("--window", type=float, default=60.0, help="Rate-limit window in seconds (default: 60).")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of accepted requests answered with 503 (default: 0).")
+    parser.add_argument("--demo", type=int, metavar="N", help="Run N concurrent checks against the mock, then exit.")
+    args = parser.parse_args()
+
+    state = MockState(args.rpm, args.window, args.error_rate)
+    server = make_server(args.host, 0 if args.demo else args.port, state)
+    if args.demo:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        ok = run_demo(server, state, args.demo)
+        server.shutdown()
+        raise SystemExit(0 if ok else 1)
+
+    print(f"Mock grammar API on http://{args.host}:{server.server_port}/ ({args.rpm} requests per {args.window:g}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,71 @@
+import argparse
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
 
-def pdf_to_latex(pdf_path, latex_path):
-    """
-    Extracts text from a PDF and saves it as a LaTeX file.
-
-    Args:
-        pdf_path (str): The path to the input PDF file.
-        latex_path (str): The path to the output LaTeX file.
-    """
-    try:
-        text = extract_text(pdf_path)
-
-        # Basic LaTeX escaping
-        text = text.replace('\\', '\\textbackslash{}')
-        text = text.replace('{', '\\{')
-        text = text.replace('}', '\\}')
-        text = text.replace('#', '\\#')
-        text = text.replace('$', '\\$')
-        text = text.replace('%', '\\%')
-        text = text.replace('&', '\\&')
-        text = text.replace('_', '\\_')
-        text = text.replace('^', '\\textasciicircum{}')
-        text = text.replace('~', '\\textasciitilde{}')
-
-        latex_content = r"""
+# Single-pass LaTeX escaping. Translating every character at once also keeps
+# the braces of \textbackslash{} from being escaped again.
+LATEX_ESCAPES = str.maketrans({
+    '\\': '\\textbackslash{}',
+    '{': '\\{',
+    '}': '\\}',
+    '#': '\\#',
+    '$': '\\$',
+    '%': '\\%',
+    '&': '\\&',
+    '_': '\\_',
+    '^': '\\textasciicircum{}',
+    '~': '\\textasciitilde{}',
+})
+
+LATEX_PREAMBLE = r"""
 \documentclass{article}
 \usepackage[utf8]{inputenc}
 
 \begin{document}
 
-""" + text + r"""
+"""
+
+LATEX_END = r"""
 
 \end{document}
 """
 
-        with open(latex_path, 'w', encoding='utf-8') as latex_file:
-            latex_file.write(latex_content)
+
+def escape_latex(text):
+    """Escape LaTeX special characters in plain text."""
+    return text.translate(LATEX_ESCAPES)
+
+
+def pdf_to_latex(pdf_path, latex_path, page_markers=False):
+    """
+    Extracts text from a PDF and saves it as a LaTeX file.
+
+    Pages are escaped and written one at a time, so memory use is bounded by
+    the largest page rather than the whole document.
+
+    Args:
+        pdf_path (str): The path to the input PDF file.
+        latex_path (str): The path to the output LaTeX file.
+        page_markers (bool): Emit a `% page N` comment before each page so
+            findings can be mapped back to PDF pages.
+    """
+    tmp_path = latex_path + '.part'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as latex_file:
+            latex_file.write(LATEX_PREAMBLE)
+            first = True
+            for page_num, page_text in iter_pages(pdf_path):
+                if not first:
+                    latex_file.write('\n\n')
+                first = False
+                if page_markers:
+                    latex_file.write(f"% page {page_num}\n")
+                latex_file.write(escape_latex(page_text))
+            latex_file.write(LATEX_END)
+        os.replace(tmp_path, latex_path)
 
         print(f"Successfully converted {pdf_path} to {latex_path}")
 
@@ -49,10 +75,18 @@ def pdf_to_latex(pdf_path, latex_path):
     except Exception as e:
         print(f"An error occurred: {e}", file=sys.stderr)
         raise
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
 
 def extract_text(pdf_path):
     """Extract textual content from the PDF using the mutool CLI."""
+    return '\n\n'.join(text for _, text in iter_pages(pdf_path))
+
+
+def iter_pages(pdf_path):
+    """Yield `(page_number, text)` for each non-empty page, one page in memory at a time."""
     if shutil.which('mutool') is None:
         raise RuntimeError("'mutool' is required to extract text. Install MuPDF tools and retry.")
 
@@ -71,7 +105,6 @@ def extract_text(pdf_path):
         except subprocess.CalledProcessError as err:
             raise RuntimeError(f"Failed to extract text using mutool: {err.stderr}") from err
 
-        text_chunks = []
         page_num = 1
         while True:
             page_file = os.path.join(tmpdir, f'page-{page_num}.txt')
@@ -79,17 +112,15 @@ def extract_text(pdf_path):
                 break
             with open(page_file, 'r', encoding='utf-8', errors='ignore') as pf:
                 page_text = pf.read().strip()
-                if page_text:
-                    text_chunks.append(page_text)
+            if page_text:
+                yield page_num, page_text
             page_num += 1
 
-        return '\n\n'.join(text_chunks)
-
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python pdf_to_latex.py <path_to_pdf_file> <path_to_latex_file>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Convert a PDF to a LaTeX file.")
+    parser.add_argument("pdf_path", help="Path to the PDF file.")
+    parser.add_argument("latex_path", help="Path to the LaTeX file to write.")
+    parser.add_argument("--page-markers", action="store_true", help="Emit a '%% page N' comment before each page.")
+    args = parser.parse_args()
 
-    pdf_file_path = sys.argv[1]
-    latex_file_path = sys.argv[2]
-    pdf_to_latex(pdf_file_path, latex_file_path)
+    pdf_to_latex(args.pdf_path, args.latex_path, page_markers=args.page_markers)
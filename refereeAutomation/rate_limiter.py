@@ -0,0 +1,167 @@
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text):
+    """Rough token estimate (about four characters per token)."""
+    return max(1, len(text) // 4)
+
+
+class RateLimitScheduler:
+    """
+    Client-side scheduler that keeps API calls within a requests-per-minute
+    and tokens-per-minute budget.
+
+    Callers are served in arrival order. Every request goes through one pooled
+    keep-alive session, and 429/5xx responses are retried with jittered
+    exponential backoff. A 429 pauses the whole queue, not just the caller
+    that received it.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute=20,
+        tokens_per_minute=40000,
+        max_retries=5,
+        backoff_base=1.0,
+        backoff_max=60.0,
+        timeout=(10, 120),
+        pool_size=10,
+        window=60.0,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.window = window
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._cond = threading.Condition()
+        self._sent = deque()  # (timestamp, tokens) within the current window
+        self._tokens_in_window = 0
+        self._next_ticket = 0
+        self._waiting = set()  # tickets blocked in acquire(); the lowest goes next
+        self._paused_until = 0.0
+
+    def _expire(self, now):
+        while self._sent and now - self._sent[0][0] >= self.window:
+            _, tokens = self._sent.popleft()
+            self._tokens_in_window -= tokens
+
+    def _wait_time(self, tokens, now):
+        """Seconds until a request of `tokens` fits the budget (0 if it fits now)."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        over_requests = len(self._sent) >= self.requests_per_minute
+        # A single request larger than the whole budget is let through on an empty window.
+        over_tokens = self._sent and self._tokens_in_window + tokens > self.tokens_per_minute
+        if not over_requests and not over_tokens:
+            return 0.0
+        if over_requests:
+            oldest = self._sent[len(self._sent) - self.requests_per_minute][0]
+            return max(oldest + self.window - now, 0.01)
+        freed = 0
+        for timestamp, sent_tokens in self._sent:
+            freed += sent_tokens
+            if self._tokens_in_window - freed + tokens <= self.tokens_per_minute:
+                return max(timestamp + self.window - now, 0.01)
+        return max(self._sent[-1][0] + self.window - now, 0.01)
+
+    def acquire(self, tokens, ticket=None):
+        """
+        Block until this caller is first in line and the budget allows `tokens`.
+
+        Returns the caller's ticket. Passing it back on a retry keeps the
+        caller's original place in the queue.
+        """
+        with self._cond:
+            if ticket is None:
+                ticket = self._next_ticket
+                self._next_ticket += 1
+            self._waiting.add(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._expire(now)
+                    if ticket == min(self._waiting):
+                        delay = self._wait_time(tokens, now)
+                        if delay == 0:
+                            self._sent.append((now, tokens))
+                            self._tokens_in_window += tokens
+                            return ticket
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+            finally:
+                # Also runs if the wait is interrupted, so an abandoned ticket
+                # never blocks the callers behind it.
+                self._waiting.discard(ticket)
+                self._cond.notify_all()
+
+    def pause(self, seconds):
+        """Hold back every queued request for `seconds` (e.g. after a 429)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def _backoff(self, attempt, retry_after=None):
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        # Full jitter: uniform in [0, base * 2**attempt], capped.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def post(self, url, tokens, **kwargs):
+        """
+        POST through the scheduler, retrying on 429/5xx and connection errors.
+
+        Returns the last response received. Raises the last
+        `requests.RequestException` if no response was ever received.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        last_error = None
+        response = None
+        ticket = None
+        for attempt in range(self.max_retries + 1):
+            ticket = self.acquire(tokens, ticket)
+            try:
+                response = self.session.post(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                last_error = e
+                response = None
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+            if attempt == self.max_retries:
+                break
+            delay = self._backoff(attempt, _retry_after(response))
+            if response is not None and response.status_code == 429:
+                self.pause(delay)
+            time.sleep(delay)
+        if response is None:
+            raise last_error
+        return response
+
+
+def _retry_after(response):
+    if response is None:
+        return None
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
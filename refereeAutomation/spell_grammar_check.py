@@ -1,31 +1,83 @@
 
 import os
+import sys
 import requests
 import argparse
 import json
 from dotenv import load_dotenv
 
+from rate_limiter import RateLimitScheduler, estimate_tokens
+
 load_dotenv()
 
+DEFAULT_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+def _env_number(name, default, cast=int, minimum=1):
+    """Read a numeric setting, falling back to `default` (with a warning) if it is invalid."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        number = None
+    if number is None or number < minimum:
+        print(f"Warning: ignoring invalid {name}={value!r}; using {default}.", file=sys.stderr)
+        return default
+    return number
+
+def scheduler_settings_from_env():
+    return {
+        "requests_per_minute": _env_number("GRAMMAR_API_RPM", 20),
+        "tokens_per_minute": _env_number("GRAMMAR_API_TPM", 40000),
+        "max_retries": _env_number("GRAMMAR_API_MAX_RETRIES", 5, minimum=0),
+        "timeout": (10, _env_number("GRAMMAR_API_TIMEOUT", 120.0, cast=float)),
+    }
+
+def configure(api_url=None, **scheduler_options):
+    """
+    (Re)build the shared scheduler, e.g. to point checks at a local mock endpoint.
+
+    Settings not passed explicitly come from the GRAMMAR_API_* environment variables.
+    """
+    global API_URL, scheduler
+    settings = scheduler_settings_from_env()
+    settings.update(scheduler_options)
+    API_URL = api_url or os.getenv("GRAMMAR_API_URL") or DEFAULT_API_URL
+    scheduler = RateLimitScheduler(**settings)
+    return scheduler
+
+# Shared by every caller in this process, so concurrent /check requests queue
+# against one requests-per-minute and tokens-per-minute budget.
+API_URL = DEFAULT_API_URL
+scheduler = None
+configure()
+
 def check_grammar_and_spell(text):
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         return "Error: GROQ_API_KEY not found in .env file."
 
-    response = requests.post(
-        url="https://openrouter.ai/api/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        },
-        data=json.dumps({
-            "model": "grok-1.5-fast",
-            "messages": [
-                {"role": "system", "content": "You are a helpful assistant that checks grammar and spelling in LaTeX files."}, 
-                {"role": "user", "content": f"Please check the grammar and spelling of the following LaTeX content and provide corrections. Only output the corrected text, without any other text or explanation. Do not modify the LaTeX commands.:\n\n{text}"}
-            ]
-        })
-    )
+    # The corrected text comes back at about the same length as the input.
+    tokens = 2 * estimate_tokens(text)
+    try:
+        response = scheduler.post(
+            API_URL,
+            tokens,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            },
+            data=json.dumps({
+                "model": "grok-1.5-fast",
+                "messages": [
+                    {"role": "system", "content": "You are a helpful assistant that checks grammar and spelling in LaTeX files."}, 
+                    {"role": "user", "content": f"Please check the grammar and spelling of the following LaTeX content and provide corrections. Only output the corrected text, without any other text or explanation. Do not modify the LaTeX commands.:\n\n{text}"}
+                ]
+            })
+        )
+    except requests.RequestException as e:
+        return f"Error: API request failed: {e}"
 
     if response.status_code == 200:
         try:
@@ -35,6 +87,22 @@ def check_grammar_and_spell(text):
     else:
         return f"Error: API request failed with status code {response.status_code}\n{response.text}"
 
+def parse_corrections(output):
+    """Split checker output of the form `line:mistake:suggestion` into dicts."""
+    errors = []
+    # This is a placeholder for the actual parsing of the output
+    # You will need to adjust this based on the actual output of check_grammar_and_spell
+    output_lines = output.strip().split('\n') if output.strip() else []
+    for line in output_lines:
+        parts = line.split(':')
+        if len(parts) >= 3:
+            errors.append({
+                'line': parts[0],
+                'mistake': parts[1],
+                'suggestion': ':'.join(parts[2:])
+            })
+    return errors
+
 def main():
     parser = argparse.ArgumentParser(description="Spell and grammar check for LaTeX files.")
     parser.add_argument("file_path", type=str, help="The absolute path to the LaTeX file.")
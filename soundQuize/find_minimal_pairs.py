@@ -0,0 +1,213 @@
+"""Discover minimal pairs for the quiz contrasts from a pronunciation dictionary.
+
+Reads a CMUdict-format dictionary (``WORD  P1 P2 ...``), indexes every
+pronunciation under one-phoneme-wildcard keys, and collects the words that
+differ only by a target contrast (L/R, V/B, S/TH, ...). Pairs are ranked by how
+often their words occur in Common Voice sentences, and the result is written as
+a pair table for ``prepare_quiz_data.py --pairs``.
+
+Usage example:
+    python find_minimal_pairs.py --dict data/cmudict.dict --tsv data/corpus/train.tsv --output data/minimal_pairs.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+
+from prepare_quiz_data import iterate_rows, normalize_word
+
+
+# ARPAbet phoneme contrasts per quiz category; stress digits are stripped.
+CATEGORY_CONTRASTS: Dict[str, List[Tuple[str, str]]] = {
+    "L_R": [("L", "R")],
+    "V_B": [("V", "B")],
+    "S_TH": [("S", "TH")],
+    "D_TH": [("D", "DH")],
+    "vowels": [
+        ("IH", "IY"),  # ship / sheep
+        ("AE", "EH"),  # bad / bed
+        ("AE", "AH"),  # cat / cut
+        ("UH", "UW"),  # full / fool
+        ("AA", "AO"),  # cot / caught
+    ],
+}
+
+Pronunciation = Tuple[str, ...]
+
+
+def parse_dictionary_line(line: str) -> Tuple[str, Pronunciation] | None:
+    line = line.strip()
+    if not line or line.startswith(";;;"):
+        return None
+    line = line.split("#", 1)[0]  # cmudict.dict trailing comments
+    parts = line.split()
+    if len(parts) < 2:
+        return None
+    word = parts[0].lower()
+    if word.endswith(")") and "(" in word:  # alternate pronunciations: word(2)
+        word = word[: word.index("(")]
+    phones = tuple(p.rstrip("012") for p in parts[1:])
+    return word, phones
+
+
+def load_pronunciations(path: Path) -> Dict[str, Set[Pronunciation]]:
+    pronunciations: Dict[str, Set[Pronunciation]] = defaultdict(set)
+    with path.open("r", encoding="latin-1") as handle:
+        for line in handle:
+            parsed = parse_dictionary_line(line)
+            if parsed is None:
+                continue
+            word, phones = parsed
+            if word.isalpha() or "'" in word:
+                pronunciations[word].add(phones)
+    return pronunciations
+
+
+def build_wildcard_index(
+    pronunciations: Dict[str, Set[Pronunciation]],
+    phonemes: Set[str],
+) -> Dict[Tuple[Pronunciation, Pronunciation], Dict[str, Set[str]]]:
+    """Map (prefix, suffix) around one wildcard position to {phoneme: words}.
+
+    Only positions holding a target phoneme are indexed, so the index grows
+    linearly with the dictionary and every bucket is a set of candidate pairs.
+    """
+    index: Dict[Tuple[Pronunciation, Pronunciation], Dict[str, Set[str]]] = defaultdict(lambda: defaultdict(set))
+    for word, prons in pronunciations.items():
+        for phones in prons:
+            for pos, phone in enumerate(phones):
+                if phone in phonemes:
+                    index[(phones[:pos], phones[pos + 1:])][phone].add(word)
+    return index
+
+
+def differs_by(pron_a: Pronunciation, pron_b: Pronunciation, first: str, second: str) -> bool:
+    """True if the pronunciations differ only at one position, `first` in a and `second` in b."""
+    if len(pron_a) != len(pron_b):
+        return False
+    diffs = [(x, y) for x, y in zip(pron_a, pron_b) if x != y]
+    return diffs == [(first, second)]
+
+
+def is_consistent_pair(
+    prons_a: Set[Pronunciation],
+    prons_b: Set[Pronunciation],
+    first: str,
+    second: str,
+) -> bool:
+    """True if every reading of word a contrasts with some reading of word b.
+
+    Words with several pronunciations are kept as long as each reading of the
+    first word still differs from the second only by the target contrast
+    (lead/read: L IY D~R IY D and L EH D~R EH D; dan/than keeps than's reduced
+    DH AH N as an extra reading). Homophones, i.e. words sharing any
+    pronunciation, are rejected.
+    """
+    if prons_a & prons_b:
+        return False
+    return all(any(differs_by(pa, pb, first, second) for pb in prons_b) for pa in prons_a)
+
+
+def find_pairs(
+    pronunciations: Dict[str, Set[Pronunciation]],
+    contrasts: Dict[str, List[Tuple[str, str]]],
+) -> Dict[str, Set[Tuple[str, str]]]:
+    """Return minimal pairs per category, ordered as (first phoneme word, second phoneme word)."""
+    phonemes = {phone for pairs in contrasts.values() for pair in pairs for phone in pair}
+    index = build_wildcard_index(pronunciations, phonemes)
+    found: Dict[str, Set[Tuple[str, str]]] = {category: set() for category in contrasts}
+    for bucket in index.values():
+        if len(bucket) < 2:
+            continue
+        for category, pairs in contrasts.items():
+            for first, second in pairs:
+                for word_a in bucket.get(first, ()):
+                    for word_b in bucket.get(second, ()):
+                        if word_a != word_b and is_consistent_pair(
+                            pronunciations[word_a], pronunciations[word_b], first, second
+                        ):
+                            found[category].add((word_a, word_b))
+    return found
+
+
+def count_words(rows: Iterable[Dict[str, str]], vocabulary: Set[str]) -> Counter:
+    counts: Counter = Counter()
+    for row in rows:
+        sentence = row.get("sentence") or row.get("text")
+        if not sentence:
+            continue
+        counts.update(w for w in map(normalize_word, sentence.split()) if w in vocabulary)
+    return counts
+
+
+def rank_pairs(
+    pairs: Dict[str, Set[Tuple[str, str]]],
+    counts: Counter,
+    max_per_category: int,
+) -> Dict[str, List[Tuple[str, str]]]:
+    """Keep pairs whose words both occur in the corpus, ranked by the rarer word.
+
+    Ranking by the minimum keeps a very common word (e.g. "the") from pulling an
+    obscure partner ("duh") to the top and flooding the category.
+    """
+    ranked: Dict[str, List[Tuple[str, str]]] = {}
+    for category, category_pairs in pairs.items():
+        scored = [(min(counts[a], counts[b]), counts[a] + counts[b], a, b) for a, b in category_pairs]
+        scored = [entry for entry in scored if entry[0] > 0]
+        scored.sort(key=lambda entry: (-entry[0], -entry[1], entry[2], entry[3]))
+        ranked[category] = [(a, b) for _, _, a, b in scored[:max_per_category]]
+    return ranked
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Find minimal pairs for quiz categories and rank them by corpus frequency.")
+    parser.add_argument("--dict", required=True, help="Path to a CMUdict-format pronunciation dictionary")
+    parser.add_argument("--tsv", required=True, nargs="+", help="Common Voice metadata TSV(s) used to rank pairs")
+    parser.add_argument(
+        "--output",
+        default="data/minimal_pairs.json",
+        help="Output pair table JSON (default: data/minimal_pairs.json)",
+    )
+    parser.add_argument(
+        "--max-pairs-per-category",
+        type=int,
+        default=200,
+        help="Keep at most this many pairs per category (default: 200)",
+    )
+    args = parser.parse_args()
+
+    dict_path = Path(args.dict)
+    if not dict_path.exists():
+        print(f"Dictionary not found: {dict_path}", file=sys.stderr)
+        sys.exit(1)
+    tsv_paths = [Path(p) for p in args.tsv]
+    for tsv_path in tsv_paths:
+        if not tsv_path.exists():
+            print(f"TSV not found: {tsv_path}", file=sys.stderr)
+            sys.exit(1)
+
+    pronunciations = load_pronunciations(dict_path)
+    pairs = find_pairs(pronunciations, CATEGORY_CONTRASTS)
+    vocabulary = {word for category_pairs in pairs.values() for pair in category_pairs for word in pair}
+    counts: Counter = Counter()
+    for tsv_path in tsv_paths:
+        counts.update(count_words(iterate_rows(tsv_path), vocabulary))
+    ranked = rank_pairs(pairs, counts, args.max_pairs_per_category)
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as handle:
+        table = {category: [list(pair) for pair in category_pairs] for category, category_pairs in ranked.items()}
+        json.dump(table, handle, indent=2)
+    for category, category_pairs in ranked.items():
+        print(f"{category}: {len(category_pairs)} pairs (of {len(pairs[category])} found)")
+    print(f"Wrote pair table to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
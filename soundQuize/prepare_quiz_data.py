@@ -111,15 +111,55 @@ def iterate_rows(tsv_path: Path) -> Iterable[Dict[str, str]]:
             yield row
 
 
+def load_pair_table(path: Path) -> Dict[str, List[Tuple[str, str]]]:
+    """Load a pair table such as the one written by find_minimal_pairs.py."""
+    with path.open("r", encoding="utf-8") as handle:
+        raw = json.load(handle)
+    return {category: [(a.lower(), b.lower()) for a, b in pairs] for category, pairs in raw.items()}
+
+
+def merge_pair_tables(
+    base: Dict[str, List[Tuple[str, str]]],
+    extra: Dict[str, List[Tuple[str, str]]],
+) -> Dict[str, List[Tuple[str, str]]]:
+    """Append extra pairs after the base ones, skipping duplicates in either order."""
+    merged = {category: list(pairs) for category, pairs in base.items()}
+    for category, pairs in extra.items():
+        target = merged.setdefault(category, [])
+        known = {frozenset(pair) for pair in target}
+        for pair in pairs:
+            if frozenset(pair) not in known:
+                target.append(pair)
+                known.add(frozenset(pair))
+    return merged
+
+
+def build_pair_index(
+    category_pairs: Dict[str, List[Tuple[str, str]]],
+) -> Dict[str, List[Tuple[int, int]]]:
+    """Map each word to the (category position, pair position) of pairs containing it."""
+    index: Dict[str, List[Tuple[int, int]]] = {}
+    for cat_pos, pairs in enumerate(category_pairs.values()):
+        for pair_pos, pair in enumerate(pairs):
+            for word in set(pair):
+                index.setdefault(word, []).append((cat_pos, pair_pos))
+    return index
+
+
 def process_file(
     tsv_path: Path,
     root: Path,
     clip_subdir: str,
     max_per_category: int,
+    category_pairs: Dict[str, List[Tuple[str, str]]] = CATEGORY_PAIRS,
 ) -> List[Dict[str, object]]:
     items: List[Dict[str, object]] = []
-    counts = {category: 0 for category in CATEGORY_PAIRS}
+    categories = list(category_pairs)
+    pair_lists = list(category_pairs.values())
+    counts = {category: 0 for category in categories}
     seen: set[tuple[str, str]] = set()
+    # Look pairs up by word so large pair tables don't cost a scan per sentence.
+    pair_index = build_pair_index(category_pairs)
 
     for row in iterate_rows(tsv_path):
         sentence = row.get("sentence") or row.get("text")
@@ -127,30 +167,30 @@ def process_file(
             continue
         words = sentence.split()
         normalized_words = [normalize_word(w) for w in words]
-        added = False
+        word_set = set(normalized_words)
 
-        for category, pairs in CATEGORY_PAIRS.items():
+        # Candidates in table order: earlier categories and pairs win, as before.
+        candidates = sorted({ref for w in word_set for ref in pair_index.get(w, ())})
+        for cat_pos, pair_pos in candidates:
+            category = categories[cat_pos]
             if counts[category] >= max_per_category:
                 continue
-            for pair in pairs:
-                if pair[0] in normalized_words and pair[1] in normalized_words:
-                    continue  # ambiguous
-                blank_index = match_pair(words, pair)
-                if blank_index == -1:
-                    continue
-
-                key = (category, sentence)
-                if key in seen:
-                    continue
-
-                audio = preferred_audio_path(row, root, clip_subdir)
-                items.append(build_item(sentence, words, blank_index, pair, category, audio))
-                seen.add(key)
-                counts[category] += 1
-                added = True
-                break
-            if added:
-                break
+            pair = pair_lists[cat_pos][pair_pos]
+            if pair[0] in word_set and pair[1] in word_set:
+                continue  # ambiguous
+            blank_index = match_pair(words, pair)
+            if blank_index == -1:
+                continue
+
+            key = (category, sentence)
+            if key in seen:
+                continue
+
+            audio = preferred_audio_path(row, root, clip_subdir)
+            items.append(build_item(sentence, words, blank_index, pair, category, audio))
+            seen.add(key)
+            counts[category] += 1
+            break
     return items
 
 
@@ -179,6 +219,10 @@ def main() -> None:
         default="data/quiz_items.json",
         help="Output JSON path (default: data/quiz_items.json)",
     )
+    parser.add_argument(
+        "--pairs",
+        help="Pair table JSON from find_minimal_pairs.py, appended to the built-in pairs",
+    )
     parser.add_argument(
         "--max-per-category",
         type=int,
@@ -192,7 +236,15 @@ def main() -> None:
         print(f"TSV not found: {tsv_path}", file=sys.stderr)
         sys.exit(1)
 
-    items = process_file(tsv_path, Path(args.root), args.clip_subdir, args.max_per_category)
+    category_pairs = CATEGORY_PAIRS
+    if args.pairs:
+        pairs_path = Path(args.pairs)
+        if not pairs_path.exists():
+            print(f"Pair table not found: {pairs_path}", file=sys.stderr)
+            sys.exit(1)
+        category_pairs = merge_pair_tables(CATEGORY_PAIRS, load_pair_table(pairs_path))
+
+    items = process_file(tsv_path, Path(args.root), args.clip_subdir, args.max_per_category, category_pairs)
     if not items:
         print("No quiz items were created. Check your pair lists or TSV content.", file=sys.stderr)
     save_items(items, Path(args.output))
@@ -0,0 +1,389 @@
+"""Serve the web quiz, quiz data, and Common Voice clips with an asyncio HTTP server.
+
+A drop-in replacement for `python3 -m http.server` that handles many concurrent
+listeners: keep-alive connections, zero-copy sendfile, byte-range and
+conditional requests, ETag/immutable cache headers, and an in-memory LRU of
+hot clips.
+
+Usage example:
+    python serve_quiz.py --port 8000
+    # then open http://localhost:8000/web/
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import email.utils
+import mimetypes
+import re
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+
+AUDIO_SUFFIXES = {".mp3", ".wav", ".ogg", ".opus", ".flac", ".m4a"}
+# Common Voice clips are content-named and never change once extracted.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+KEEPALIVE_TIMEOUT = 15.0
+MAX_HEADERS = 100
+# Only these top-level directories are served; everything else under --root
+# (scripts, .env, instruction.tex, ...) answers 404.
+SERVED_PREFIXES = ("web", "data")
+RANGE_SPEC = re.compile(r"(\d*)-(\d*)")
+MAX_DISCARDED_BODY = 64 * 1024
+
+REASONS = {
+    200: "OK",
+    206: "Partial Content",
+    301: "Moved Permanently",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    416: "Range Not Satisfiable",
+}
+
+mimetypes.add_type("audio/mpeg", ".mp3")
+mimetypes.add_type("audio/ogg", ".opus")
+mimetypes.add_type("application/json", ".json")
+
+
+class ClipCache:
+    """Byte-bounded LRU of small files, keyed by path and ETag."""
+
+    def __init__(self, max_bytes: int, max_item_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.max_item_bytes = max_item_bytes
+        self.size = 0
+        self._items: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        data = self._items.get(key)
+        if data is not None:
+            self._items.move_to_end(key)
+        return data
+
+    def put(self, key: Tuple[str, str], data: bytes) -> None:
+        if len(data) > self.max_item_bytes or key in self._items:
+            return
+        self._items[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class RangeNotSatisfiable(Exception):
+    """The requested byte range lies outside the file."""
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Return an inclusive (start, end) for a single `bytes=` range.
+
+    Returns None for multi-range or malformed headers, which are answered with
+    the full body, and raises RangeNotSatisfiable for ranges past the end.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    # Digits only: signs, spaces, and underscores that int() would accept are malformed here.
+    match = RANGE_SPEC.fullmatch(spec.strip())
+    if match is None or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        suffix = int(last)
+        if suffix == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+class QuizServer:
+    def __init__(self, root: Path, cache: ClipCache) -> None:
+        self.root = root.resolve()
+        self.cache = cache
+
+    def resolve(self, url_path: str) -> Optional[Path]:
+        """Map a URL path to a file under an allowed prefix, or None (answered with 404)."""
+        try:
+            target = (self.root / unquote(url_path).lstrip("/")).resolve()
+        except (OSError, ValueError):  # e.g. embedded NUL bytes
+            return None
+        if self.root not in target.parents:
+            return None
+        parts = target.relative_to(self.root).parts
+        if parts[0] not in SERVED_PREFIXES or any(part.startswith(".") for part in parts):
+            return None
+        return target
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+                if not request_line:
+                    break
+                headers = await self.read_headers(reader)
+                parts = request_line.decode("latin-1").split()
+                if headers is None or len(parts) != 3:
+                    await self.send_simple(writer, 400, close=True)
+                    break
+                method, target, version = parts
+                keep_alive = self.wants_keep_alive(version, headers)
+                if method not in ("GET", "HEAD"):
+                    keep_alive = False
+                elif not await self.discard_body(reader, headers):
+                    keep_alive = False
+                await self.respond(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:  # request line or header longer than the stream limit
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def read_headers(reader: asyncio.StreamReader) -> Optional[Dict[str, str]]:
+        headers: Dict[str, str] = {}
+        for _ in range(MAX_HEADERS):
+            line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, sep, value = line.decode("latin-1").partition(":")
+            if not sep:
+                return None
+            headers[name.strip().lower()] = value.strip()
+        return None
+
+    @staticmethod
+    async def discard_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> bool:
+        """Skip a small GET/HEAD body; return False if the stream cannot be resynchronised."""
+        if "transfer-encoding" in headers:
+            return False
+        length = headers.get("content-length", "0")
+        if not length.isdigit() or int(length) > MAX_DISCARDED_BODY:
+            return False
+        if int(length):
+            await asyncio.wait_for(reader.readexactly(int(length)), KEEPALIVE_TIMEOUT)
+        return True
+
+    @staticmethod
+    def wants_keep_alive(version: str, headers: Dict[str, str]) -> bool:
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            return connection != "close"
+        return connection == "keep-alive"
+
+    async def respond(
+        self,
+        writer: asyncio.StreamWriter,
+        method: str,
+        target: str,
+        headers: Dict[str, str],
+        keep_alive: bool,
+    ) -> None:
+        if method not in ("GET", "HEAD"):
+            # Any request body is unread, so the connection cannot be reused.
+            await self.send_simple(writer, 405, {"Allow": "GET, HEAD"}, keep_alive=False)
+            return
+        url_path = urlsplit(target).path
+        if url_path == "/":
+            await self.send_simple(writer, 301, {"Location": "/web/"}, keep_alive=keep_alive)
+            return
+        path = self.resolve(url_path)
+        if path is None:
+            await self.send_simple(writer, 404, keep_alive=keep_alive)
+            return
+        if path.is_dir():
+            if not url_path.endswith("/"):
+                await self.send_simple(writer, 301, {"Location": url_path + "/"}, keep_alive=keep_alive)
+                return
+            path = path / "index.html"
+        try:
+            stat = path.stat()
+        except OSError:
+            await self.send_simple(writer, 404, keep_alive=keep_alive)
+            return
+        if not path.is_file():
+            await self.send_simple(writer, 404, keep_alive=keep_alive)
+            return
+
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+        is_audio = path.suffix.lower() in AUDIO_SUFFIXES
+        response_headers = {
+            "Content-Type": mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Accept-Ranges": "bytes",
+            "Cache-Control": IMMUTABLE_CACHE if is_audio else REVALIDATE_CACHE,
+        }
+
+        if self.not_modified(headers, etag, stat.st_mtime):
+            await self.send_head(writer, 304, response_headers, None, keep_alive)
+            return
+
+        status = 200
+        start, end = 0, size - 1
+        range_header = headers.get("range")
+        if range_header and size and self.range_applies(headers.get("if-range"), etag, last_modified):
+            try:
+                byte_range = parse_range(range_header, size)
+            except RangeNotSatisfiable:
+                await self.send_simple(writer, 416, {"Content-Range": f"bytes */{size}"}, keep_alive=keep_alive)
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                status = 206
+                response_headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        length = end - start + 1 if size else 0
+        await self.send_head(writer, status, response_headers, length, keep_alive)
+        if method == "HEAD" or length == 0:
+            return
+        await self.send_body(writer, path, etag, size, start, length, is_audio)
+
+    @staticmethod
+    def not_modified(headers: Dict[str, str], etag: str, mtime: float) -> bool:
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        if_modified_since = headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    @staticmethod
+    def range_applies(if_range: Optional[str], etag: str, last_modified: str) -> bool:
+        return if_range is None or if_range in (etag, last_modified)
+
+    async def send_body(
+        self,
+        writer: asyncio.StreamWriter,
+        path: Path,
+        etag: str,
+        size: int,
+        start: int,
+        length: int,
+        is_audio: bool,
+    ) -> None:
+        key = (str(path), etag)
+        data = self.cache.get(key)
+        if data is None and is_audio and size <= self.cache.max_item_bytes:
+            data = await asyncio.to_thread(path.read_bytes)
+            if len(data) == size:
+                self.cache.put(key, data)
+            else:  # file changed while being read; serve it but do not cache
+                data = None
+        if data is not None:
+            writer.write(data[start:start + length])
+            await writer.drain()
+            return
+        await writer.drain()
+        loop = asyncio.get_running_loop()
+        with path.open("rb") as handle:
+            # Uses os.sendfile on plain sockets, falling back to buffered reads otherwise.
+            await loop.sendfile(writer.transport, handle, start, length)
+
+    async def send_head(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        headers: Dict[str, str],
+        length: Optional[int],
+        keep_alive: bool,
+    ) -> None:
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+        lines.append(f"Date: {email.utils.formatdate(usegmt=True)}")
+        lines.append("Server: soundQuize")
+        for name, value in headers.items():
+            lines.append(f"{name}: {value}")
+        if length is not None:
+            lines.append(f"Content-Length: {length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def send_simple(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        headers: Optional[Dict[str, str]] = None,
+        keep_alive: bool = True,
+        close: bool = False,
+    ) -> None:
+        body = f"{status} {REASONS[status]}\n".encode("ascii")
+        all_headers = {"Content-Type": "text/plain; charset=utf-8"}
+        all_headers.update(headers or {})
+        await self.send_head(writer, status, all_headers, len(body), keep_alive and not close)
+        writer.write(body)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, root: Path, cache: ClipCache) -> None:
+    server = QuizServer(root, cache)
+    listener = await asyncio.start_server(server.handle, host, port, backlog=1024)
+    shown_host = "localhost" if host in ("", "0.0.0.0", "127.0.0.1") else host
+    print(f"Serving {server.root} at http://{shown_host}:{port}/web/ (Ctrl+C to stop)")
+    async with listener:
+        await listener.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the web quiz, quiz data, and audio clips.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on (default: 8000)")
+    parser.add_argument(
+        "--root",
+        default=str(Path(__file__).resolve().parent),
+        help="Directory containing web/ and data/; only those two are served (default: this script's directory)",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        default=64,
+        help="Memory budget for the hot-clip cache in MB (default: 64, 0 disables)",
+    )
+    parser.add_argument(
+        "--cache-max-clip-kb",
+        type=int,
+        default=512,
+        help="Largest clip kept in the cache, in KB (default: 512)",
+    )
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir():
+        print(f"Root directory not found: {root}", file=sys.stderr)
+        sys.exit(1)
+
+    cache = ClipCache(args.cache_mb * 1024 * 1024, args.cache_max_clip_kb * 1024 if args.cache_mb else -1)
+    try:
+        asyncio.run(serve(args.host, args.port, root, cache))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()